@@ -90,6 +90,13 @@ def test_code(session: nox.Session) -> None:
     session.run("pytest")
 
 
+@nox.session(python=python_version)
+def test_numba(session: nox.Session) -> None:
+    """Test the optional numba kernels against their NumPy fallbacks."""
+    install(session, groups=["tests"], root=True, extras=True)
+    session.run("pytest", "tests/test_geo.py", env={"OGDRB_REQUIRE_NUMBA": "1"})
+
+
 @nox.session(python=python_version)
 def i18n_extract(session: nox.Session) -> None:
     """Extract translatable strings to POT file."""
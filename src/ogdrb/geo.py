@@ -0,0 +1,271 @@
+"""Geo."""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = (
+    "EARTH_RADIUS_KM",
+    "Bounds",
+    "GridCluster",
+    "RepeaterIndex",
+    "coordinates",
+    "filter_radius",
+    "grid_cluster",
+    "haversine_km",
+)
+
+import math
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+import numpy as np
+from haversine.haversine import get_avg_earth_radius  # type: ignore[import-untyped]
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+    from repeaterbook import Repeater
+    from repeaterbook.utils import Radius
+
+
+# Mean Earth radius, same value used by the ``haversine`` package.
+EARTH_RADIUS_KM: Final[float] = 6371.0088
+
+# Web Mercator tile size, and the latitude limit of the projection.
+_TILE_SIZE_PX: Final[int] = 256
+_MAX_MERCATOR_LAT: Final[float] = 85.051129
+
+
+def haversine_km[F: np.floating[Any]](
+    lat1: float,
+    lng1: float,
+    lat2: NDArray[F],
+    lng2: NDArray[F],
+) -> NDArray[F]:
+    """Return the great-circle distances in km from one point to many points.
+
+    The single origin (``lat1``, ``lng1``) is compared against the arrays
+    ``lat2``/``lng2`` in one vectorized pass. All coordinates are in degrees.
+    The result has the same precision as ``lat2``/``lng2``.
+    """
+    lat1_r = math.radians(lat1)
+    lat2_r = np.radians(lat2)
+    dlat = lat2_r - lat1_r
+    dlng = np.radians(lng2) - math.radians(lng1)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + math.cos(lat1_r) * np.cos(lat2_r) * np.sin(dlng / 2) ** 2
+    )
+    distances: NDArray[F] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    return distances
+
+
+# With the optional ``numba`` extra installed, distances are computed by a
+# compiled loop instead, which skips NumPy's temporary arrays.
+try:
+    from numba import njit  # type: ignore[import-not-found]
+except ImportError:
+    _distances_km = haversine_km
+else:
+
+    @njit(cache=True, fastmath=True)  # type: ignore[untyped-decorator]
+    def _distances_km[F: np.floating[Any]](
+        lat1: float,
+        lng1: float,
+        lat2: NDArray[F],
+        lng2: NDArray[F],
+    ) -> NDArray[F]:
+        lat1_r = math.radians(lat1)
+        lng1_r = math.radians(lng1)
+        cos_lat1 = math.cos(lat1_r)
+        distances = np.empty_like(lat2)
+        for i in range(lat2.size):
+            lat2_r = math.radians(lat2[i])
+            a = (
+                math.sin((lat2_r - lat1_r) / 2) ** 2
+                + cos_lat1
+                * math.cos(lat2_r)
+                * math.sin((math.radians(lng2[i]) - lng1_r) / 2) ** 2
+            )
+            distances[i] = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+        return distances
+
+
+def coordinates(
+    repeaters: Sequence[Repeater],
+) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """Return the latitudes and longitudes of the repeaters as two arrays.
+
+    Single precision is plenty for repeater distances (well under a meter of
+    error) and halves the memory traffic of the distance computations.
+    """
+    count = len(repeaters)
+    lats = np.fromiter(
+        (float(r.latitude) for r in repeaters), dtype=np.float32, count=count
+    )
+    lngs = np.fromiter(
+        (float(r.longitude) for r in repeaters), dtype=np.float32, count=count
+    )
+    return lats, lngs
+
+
+def _radius_km(radius: Radius) -> float:
+    """Return the radius distance in km, using the same Earth radius."""
+    avg_earth_radius: float = get_avg_earth_radius(radius.unit)
+    return radius.distance * EARTH_RADIUS_KM / avg_earth_radius
+
+
+def _within[F: np.floating[Any]](
+    lats: NDArray[F], lngs: NDArray[F], radius: Radius
+) -> NDArray[np.intp]:
+    """Return the indices of the points within the radius, sorted by distance."""
+    distances = _distances_km(radius.origin.lat, radius.origin.lon, lats, lngs)
+    # Mask first, then only sort the points that are actually inside.
+    inside = np.flatnonzero(distances <= _radius_km(radius))
+    return inside[np.argsort(distances[inside], kind="stable")]
+
+
+def filter_radius(
+    repeaters: Sequence[Repeater],
+    radius: Radius,
+    *,
+    coords: tuple[NDArray[np.float32], NDArray[np.float32]] | None = None,
+) -> list[Repeater]:
+    """Filter repeaters within a given radius, and sort by distance.
+
+    Drop-in replacement for ``repeaterbook.queries.filter_radius`` that computes
+    every distance at once with NumPy instead of one Python call per repeater.
+    ``coords`` may be given as the result of ``coordinates(repeaters)``, to
+    reuse them across several radii.
+    """
+    lats, lngs = coordinates(repeaters) if coords is None else coords
+    return [repeaters[i] for i in _within(lats, lngs, radius).tolist()]
+
+
+class RepeaterIndex:
+    """Static in-memory spatial index of repeaters, for many radius queries.
+
+    Repeaters are sorted by latitude once, so each query only computes distances
+    for the latitude band that can possibly be within its radius (found by
+    binary search), instead of for every repeater.
+    """
+
+    def __init__(self, repeaters: Sequence[Repeater]) -> None:
+        """Index the given repeaters by their coordinates."""
+        lats, lngs = coordinates(repeaters)
+        order = np.argsort(lats, kind="stable")
+        self._repeaters = [repeaters[i] for i in order.tolist()]
+        self._lats = lats[order]
+        self._lngs = lngs[order]
+
+    def __len__(self) -> int:
+        """Return the number of indexed repeaters."""
+        return len(self._repeaters)
+
+    def within(self, radius: Radius) -> list[Repeater]:
+        """Return the repeaters within a given radius, sorted by distance."""
+        # Degrees of latitude spanned by the radius, with a little slack for
+        # the single precision coordinates.
+        lat_span = math.degrees(_radius_km(radius) / EARTH_RADIUS_KM) + 1e-4
+        start, stop = np.searchsorted(
+            self._lats,
+            [radius.origin.lat - lat_span, radius.origin.lat + lat_span],
+        ).tolist()
+        inside = _within(self._lats[start:stop], self._lngs[start:stop], radius)
+        return [self._repeaters[start + i] for i in inside.tolist()]
+
+
+class Bounds(NamedTuple):
+    """Geographic bounding box, in degrees."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+
+class GridCluster(NamedTuple):
+    """Points aggregated into one grid cell."""
+
+    lat: float
+    lng: float
+    size: int
+    bounds: Bounds
+
+
+def _mercator_px(
+    lats: NDArray[np.float64], lngs: NDArray[np.float64], zoom: int
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Project coordinates to Web Mercator pixels at the given zoom level."""
+    scale = _TILE_SIZE_PX * 2.0**zoom
+    lat_r = np.radians(np.clip(lats, -_MAX_MERCATOR_LAT, _MAX_MERCATOR_LAT))
+    x = (lngs + 180.0) / 360.0 * scale
+    y = (1.0 - np.log(np.tan(lat_r) + 1.0 / np.cos(lat_r)) / math.pi) / 2.0 * scale
+    return x, y
+
+
+def grid_cluster(  # noqa: PLR0913
+    lats: NDArray[np.float64],
+    lngs: NDArray[np.float64],
+    zoom: int,
+    bounds: Bounds,
+    *,
+    cell_px: float = 60.0,
+    max_zoom: int = 16,
+) -> tuple[list[GridCluster], NDArray[np.intp]]:
+    """Aggregate the points inside ``bounds`` into screen-space grid cells.
+
+    Points are projected to Web Mercator pixels at ``zoom`` and bucketed into
+    ``cell_px`` squares. Cells holding more than one point become clusters;
+    lone points are returned as indices into ``lats``/``lngs``. Above
+    ``max_zoom`` nothing is clustered.
+
+    Returns:
+        The clusters, and the indices of the unclustered points.
+    """
+    lng_span = bounds.east - bounds.west
+    in_lng = (
+        np.ones(len(lngs), dtype=np.bool_)
+        if lng_span >= 360.0  # noqa: PLR2004
+        else np.mod(lngs - bounds.west, 360.0) <= lng_span
+    )
+    visible = np.flatnonzero(in_lng & (lats >= bounds.south) & (lats <= bounds.north))
+    if zoom > max_zoom or len(visible) == 0:
+        return [], visible
+
+    v_lats = lats[visible]
+    v_lngs = lngs[visible]
+    x, y = _mercator_px(v_lats, v_lngs, zoom)
+    cells = np.floor(x / cell_px).astype(np.int64) << 32 | np.floor(y / cell_px).astype(
+        np.int64
+    )
+    _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+
+    clustered = counts > 1
+    lonely = visible[~clustered[inverse]]
+    if not clustered.any():
+        return [], lonely
+
+    n_cells = len(counts)
+    mean_lat = np.bincount(inverse, weights=v_lats, minlength=n_cells) / counts
+    mean_lng = np.bincount(inverse, weights=v_lngs, minlength=n_cells) / counts
+    south = np.full(n_cells, np.inf)
+    west = np.full(n_cells, np.inf)
+    north = np.full(n_cells, -np.inf)
+    east = np.full(n_cells, -np.inf)
+    np.minimum.at(south, inverse, v_lats)
+    np.minimum.at(west, inverse, v_lngs)
+    np.maximum.at(north, inverse, v_lats)
+    np.maximum.at(east, inverse, v_lngs)
+
+    clusters = [
+        GridCluster(
+            lat=float(mean_lat[i]),
+            lng=float(mean_lng[i]),
+            size=int(counts[i]),
+            bounds=Bounds(
+                float(south[i]), float(west[i]), float(north[i]), float(east[i])
+            ),
+        )
+        for i in np.flatnonzero(clustered).tolist()
+    ]
+    return clusters, lonely
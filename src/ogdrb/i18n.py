@@ -114,6 +114,20 @@ def _get_translation(
     return _translations[lang_code]
 
 
+# Localized territory names cache, keyed by language code.
+_territories: dict[str, dict[str, str]] = {}
+
+
+def _get_territories(lang_code: str) -> dict[str, str]:
+    """Return cached localized territory names (alpha-2 -> name) for *lang_code*."""
+    if lang_code not in _territories:
+        territories = Locale.parse(lang_code.replace("-", "_")).territories
+        _territories[lang_code] = {
+            code: str(name) for code, name in (territories or {}).items()
+        }
+    return _territories[lang_code]
+
+
 def _current_lang_code() -> str:
     """Return the current user's language code.
 
@@ -144,11 +158,7 @@ def territory_name(alpha_2: str) -> str:
     Uses the current user's language.  Falls back to *alpha_2* when no
     translation is available.
     """
-    locale = Locale.parse(_current_lang_code().replace("-", "_"))
-    territories = locale.territories
-    if territories is None:
-        return alpha_2
-    return str(territories.get(alpha_2, alpha_2))
+    return _get_territories(_current_lang_code()).get(alpha_2, alpha_2)
 
 
 def _parse_accept_languages(header: str) -> list[str]:
@@ -4,17 +4,30 @@ from __future__ import annotations
 
 __all__: tuple[str, ...] = ()
 
+import copy
+import functools
+import itertools
 import json
 import os
 from datetime import UTC, datetime
 from enum import StrEnum
 from html import escape
-from typing import TYPE_CHECKING, Any, NamedTuple, NotRequired, TypedDict, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Final,
+    NamedTuple,
+    NotRequired,
+    TypedDict,
+    cast,
+)
 
+import numpy as np
 import pycountry
 import us  # type: ignore[import-untyped]
 from haversine import Unit  # type: ignore[import-untyped]
 from loguru import logger
+from nicegui import json as nicegui_json
 from nicegui import ui
 from opengd77.constants import Max
 from opengd77.converters import codeplug_to_csvs, csvs_to_zip
@@ -22,6 +35,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from repeaterbook.models import ExportQuery
 from repeaterbook.utils import LatLon, Radius
 
+from ogdrb.geo import Bounds, grid_cluster
 from ogdrb.i18n import language_manager, t, territory_name
 from ogdrb.organizer import organize
 from ogdrb.services import (
@@ -32,9 +46,12 @@ from ogdrb.services import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from nicegui.elements.aggrid import AgGrid
     from nicegui.elements.leaflet import Leaflet
     from nicegui.events import GenericEventArguments
+    from numpy.typing import NDArray
     from pycountry.db import Country
     from repeaterbook import Repeater
 
@@ -92,6 +109,117 @@ US_STATES = {
     if state.fips is not None
 }
 
+# Alpha-2 codes of every country, for the country selector
+COUNTRY_CODES: tuple[str, ...] = tuple(
+    country.alpha_2
+    for country in pycountry.countries  # type: ignore[no-untyped-call]
+)
+
+# Repeater marker popup. Fields are HTML, so values must be escaped beforehand.
+REPEATER_POPUP = (
+    "<b>{callsign}</b>{status}<br>{city}, {state}<br>{country}<br>{frequency} MHz"
+).format
+
+# Leaflet.draw toolbar: circles only, all other shapes disabled. Pages get a deep
+# copy, so no client can mutate the shared template.
+DRAW_CONTROL: Final[dict[str, Any]] = {
+    "draw": {
+        "circle": True,
+        "marker": False,
+        "polygon": False,
+        "polyline": False,
+        "rectangle": False,
+        "circlemarker": False,
+    },
+    "edit": {"edit": True, "remove": True},
+}
+
+# Static AG Grid options. Each page deep-copies them and adds ``columnDefs``
+# (translated) and ``rowData`` (per client).
+AGGRID_OPTIONS: Final[dict[str, Any]] = {
+    "defaultColDef": {
+        "sortable": False,
+    },
+    "rowSelection": {"mode": "multiRow"},
+    "stopEditingWhenCellsLoseFocus": True,
+}
+
+
+@functools.lru_cache(maxsize=512)
+def lookup_country(code: str) -> Country:
+    """Look up a country by code, caching pycountry's index scan."""
+    return pycountry.countries.lookup(code)  # type: ignore[no-untyped-call]
+
+
+def merge_colocated_markers(
+    markers: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Merge repeater markers at identical coordinates into one.
+
+    Co-located repeaters can't be split apart by zooming in, so each group
+    becomes a single marker listing all of them in its tooltip and popup. Its
+    ``c`` is ``None`` if the group mixes compatible and incompatible repeaters.
+    """
+    groups: dict[tuple[float, float], list[dict[str, Any]]] = {}
+    for marker in markers:
+        groups.setdefault((marker["lat"], marker["lng"]), []).append(marker)
+    merged: list[dict[str, Any]] = []
+    for group in groups.values():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        compatible = {marker["c"] for marker in group}
+        merged.append(
+            {
+                "lat": group[0]["lat"],
+                "lng": group[0]["lng"],
+                "t": "<br>".join(marker["t"] for marker in group),
+                "p": "<hr>".join(marker["p"] for marker in group),
+                "c": compatible.pop() if len(compatible) == 1 else None,
+            }
+        )
+    return merged
+
+
+class RepeaterMarkers:
+    """Markers of the loaded repeaters, kept server-side for one client.
+
+    The browser only reports its viewport, and gets back the clusters and
+    points in view.
+    """
+
+    def __init__(self) -> None:
+        """Start with no repeaters loaded."""
+        self._markers: list[dict[str, Any]] = []
+        self._lats: NDArray[np.float64] = np.empty(0)
+        self._lngs: NDArray[np.float64] = np.empty(0)
+
+    def clear(self) -> None:
+        """Drop the loaded markers."""
+        self.load([])
+
+    def load(self, markers: list[dict[str, Any]]) -> None:
+        """Replace the loaded markers, merging co-located ones."""
+        self._markers = merge_colocated_markers(markers)
+        count = len(self._markers)
+        self._lats = np.fromiter(
+            (d["lat"] for d in self._markers), dtype=np.float64, count=count
+        )
+        self._lngs = np.fromiter(
+            (d["lng"] for d in self._markers), dtype=np.float64, count=count
+        )
+
+    def viewport(self, bounds: Bounds, zoom: int) -> dict[str, list[Any]]:
+        """Return the clusters (``c``) and lone points (``p``) within bounds."""
+        clusters, points = grid_cluster(self._lats, self._lngs, zoom, bounds)
+        return {
+            "c": [
+                {"lat": c.lat, "lng": c.lng, "n": c.size, "b": tuple(c.bounds)}
+                for c in clusters
+            ],
+            "p": [self._markers[i] for i in points.tolist()],
+        }
+
 
 class ZoneManager:
     """Manages bidirectional sync between Leaflet map circles and AG Grid rows.
@@ -119,10 +247,14 @@ class ZoneManager:
         self._grid = grid
         self._grid_id = grid.id
         self._rows: list[ZoneRow] = grid.options["rowData"]  # type: ignore[assignment]
+        self._rows_by_id: dict[int, ZoneRow] = {r["id"]: r for r in self._rows}
         self._row_to_leaflet: dict[int, int] = {}
         self._leaflet_to_row: dict[int, int] = {}
-        self._next_id = 1
+        # Last color sent per leaflet_id, so unchanged circles are not restyled
+        self._circle_colors: dict[int, str] = {}
+        self._ids = itertools.count(1)
         self._flush_timer: object | None = None
+        self._selection_timer: object | None = None
 
     @property
     def rows(self) -> list[ZoneRow]:
@@ -171,9 +303,7 @@ class ZoneManager:
     # -- ID management ----------------------------------------------------------
 
     def _new_id(self) -> int:
-        row_id = self._next_id
-        self._next_id += 1
-        return row_id
+        return next(self._ids)
 
     def _new_zone_name(self) -> str:
         existing_names = {row["name"] for row in self._rows}
@@ -193,14 +323,19 @@ class ZoneManager:
         leaflet_id = self._row_to_leaflet.pop(row_id, None)
         if leaflet_id is not None:
             self._leaflet_to_row.pop(leaflet_id, None)
+            self._circle_colors.pop(leaflet_id, None)
+
+    def _add_row(self, row: ZoneRow) -> None:
+        self._rows.append(row)
+        self._rows_by_id[row["id"]] = row
 
     def _find_row(self, row_id: int) -> ZoneRow | None:
-        """Find row by ID via linear scan of the canonical ``self._rows`` list.
+        """Find row by ID via the ``self._rows_by_id`` index.
 
-        The list is kept small (bounded by ``Max.ZONES``), so the O(n) cost
-        is negligible.
+        The index holds the same dict objects as the canonical ``self._rows``
+        list, so rows found here can be updated in place.
         """
-        return next((r for r in self._rows if r["id"] == row_id), None)
+        return self._rows_by_id.get(row_id)
 
     def _resolve_row_id(self, layer: dict[str, Any]) -> int | None:
         """Resolve a row ID from a Leaflet layer dict.
@@ -299,9 +434,18 @@ class ZoneManager:
         )
 
     async def _js_set_circle_colors(self, color_map: dict[int, str]) -> None:
-        """Batch-update circle colors. ``color_map``: leaflet_id -> color."""
+        """Batch-update circle colors. ``color_map``: leaflet_id -> color.
+
+        Only circles whose color actually changes are sent to the browser.
+        """
+        color_map = {
+            lid: color
+            for lid, color in color_map.items()
+            if self._circle_colors.get(lid) != color
+        }
         if not color_map:
             return
+        self._circle_colors.update(color_map)
         entries_json = json.dumps({str(k): v for k, v in color_map.items()})
         await ui.run_javascript(
             f"""
@@ -381,7 +525,7 @@ class ZoneManager:
             lng=center["lng"],
             radius=radius_m / 1000,
         )
-        self._rows.append(new_row)
+        self._add_row(new_row)
 
         if leaflet_id is not None:
             # NiceGUI already added the circle; just register and set up click handler.
@@ -411,7 +555,7 @@ class ZoneManager:
             row_id = self._resolve_row_id(layer)
             if row_id is None:
                 continue
-            if row := self._find_row(row_id):
+            if row := self._rows_by_id.pop(row_id, None):
                 self._rows.remove(row)
                 self._unregister(row_id)
 
@@ -421,7 +565,9 @@ class ZoneManager:
         """Grid cell edited -> update row + sync circle only if geometry changed."""
         data = e.args["data"]
         row_id = int(data["id"])
-        old_row = self._find_row(row_id)
+        row = self._find_row(row_id)
+        if row is None:
+            return
 
         new_row = ZoneRow(
             id=row_id,
@@ -430,22 +576,21 @@ class ZoneManager:
             lng=float(data["lng"]),
             radius=float(data["radius"]),
         )
-        self._rows[:] = [new_row if r["id"] == row_id else r for r in self._rows]
-
-        if old_row is not None:
-            geometry_changed = (
-                old_row["lat"] != new_row["lat"]
-                or old_row["lng"] != new_row["lng"]
-                or old_row["radius"] != new_row["radius"]
+        geometry_changed = (
+            row["lat"] != new_row["lat"]
+            or row["lng"] != new_row["lng"]
+            or row["radius"] != new_row["radius"]
+        )
+        row.update(new_row)
+
+        leaflet_id = self._row_to_leaflet.get(row_id)
+        if geometry_changed and leaflet_id is not None:
+            await self._js_update_circle(
+                leaflet_id,
+                new_row["lat"],
+                new_row["lng"],
+                new_row["radius"] * 1000,
             )
-            leaflet_id = self._row_to_leaflet.get(row_id)
-            if geometry_changed and leaflet_id is not None:
-                await self._js_update_circle(
-                    leaflet_id,
-                    new_row["lat"],
-                    new_row["lng"],
-                    new_row["radius"] * 1000,
-                )
 
     async def handle_circle_click(self, e: GenericEventArguments) -> None:
         """Circle clicked on map -> select the corresponding row in the grid."""
@@ -455,7 +600,16 @@ class ZoneManager:
         await self._js_select_grid_row(int(row_id))
 
     async def handle_selection_changed(self, _e: GenericEventArguments) -> None:
-        """Grid row selection changed -> batch-update circle colors."""
+        """Grid row selection changed -> debounced batch-update of circle colors.
+
+        ``rowSelected`` fires once per row, so selecting many rows at once
+        (e.g. select all) is coalesced into a single color update.
+        """
+        self._schedule_selection_sync()
+
+    async def _sync_selection_colors(self) -> None:
+        """Color selected zones' circles red, the rest blue."""
+        self._selection_timer = None
         selected_rows = cast(
             "list[ZoneRow]",
             await self._grid.get_selected_rows(),  # type: ignore[no-untyped-call]
@@ -480,7 +634,7 @@ class ZoneManager:
         row_id = self._new_id()
         row_name = self._new_zone_name()
         new_row = ZoneRow(id=row_id, name=row_name, lat=0.0, lng=0.0, radius=radius)
-        self._rows.append(new_row)
+        self._add_row(new_row)
         leaflet_id = await self._js_add_circle(0.0, 0.0, radius * 1000, row_id)
         if leaflet_id is not None:
             self._register(row_id, leaflet_id)
@@ -500,6 +654,7 @@ class ZoneManager:
         await self._js_remove_circles(leaflet_ids)
         for row_id in selected_ids:
             self._unregister(row_id)
+            self._rows_by_id.pop(row_id, None)
         self._rows[:] = [r for r in self._rows if r["id"] not in selected_ids]
 
     # -- Private helpers --------------------------------------------------------
@@ -526,20 +681,28 @@ class ZoneManager:
 
         self._flush_timer = ui.timer(delay, flush, once=True, immediate=False)
 
+    def _schedule_selection_sync(self, delay: float = 0.1) -> None:
+        """Schedule a single circle color update after a short delay."""
+        if self._selection_timer is not None:
+            return
+        self._selection_timer = ui.timer(
+            delay, self._sync_selection_colors, once=True, immediate=False
+        )
+
 
 @ui.page("/", response_timeout=20)
 async def index() -> None:  # noqa: C901, PLR0915
     language_manager.quasar_html()
 
-    repeater_cluster: Any | None = None
+    repeater_layer: Any | None = None
+    repeater_markers = RepeaterMarkers()
+    # Don't hold on to the markers once the client is gone
+    ui.context.client.on_delete(repeater_markers.clear)
 
     def selected_filters() -> CountrySelection:
         selected_country_codes = frozenset(select_country.value or ())
         selected_us_states = frozenset(select_us_state.value or ())
-        countries = cast(
-            "set[Country]",
-            {pycountry.countries.lookup(country) for country in selected_country_codes},  # type: ignore[no-untyped-call]
-        )
+        countries = {lookup_country(country) for country in selected_country_codes}
         return CountrySelection(selected_country_codes, selected_us_states, countries)
 
     def validate_filters() -> CountrySelection | None:
@@ -556,78 +719,91 @@ async def index() -> None:  # noqa: C901, PLR0915
         return CountrySelection(selected_country_codes, selected_us_states, countries)
 
     async def sync_repeater_markers(
-        repeaters: list[Repeater],
+        repeaters: Sequence[Repeater],
         compatible_ids: set[tuple[str | None, str, int]],
     ) -> None:
-        if repeater_cluster is None:
+        if repeater_layer is None:
             return
-        m.run_layer_method(repeater_cluster.id, "clearLayers")  # type: ignore[no-untyped-call]
 
-        chunk_size = 250
         compatible_count = 0
         incompatible_count = 0
+        unknown = t("Unknown")
+        incompatible_status = escape(" " + t("⚠️ INCOMPATIBLE"))
+
+        payload: list[dict[str, Any]] = []
+        for repeater in repeaters:
+            callsign = repeater.callsign or unknown
+            city = repeater.location_nearest_city
+            state = repeater.state or ""
+            country = repeater.country or ""
+            frequency = str(repeater.frequency)
+
+            # Check if repeater is in the compatible set
+            repeater_id = (
+                repeater.country,
+                repeater.state_id,
+                repeater.repeater_id,
+            )
+            compatible = repeater_id in compatible_ids
+            if compatible:
+                compatible_count += 1
+            else:
+                incompatible_count += 1
+
+            status = "" if compatible else incompatible_status
+            popup = REPEATER_POPUP(
+                callsign=escape(callsign),
+                status=status,
+                city=escape(city),
+                state=escape(state),
+                country=escape(country),
+                frequency=escape(frequency),
+            )
+            payload.append(
+                {
+                    "lat": float(repeater.latitude),
+                    "lng": float(repeater.longitude),
+                    "t": escape(f"{callsign} ({frequency} MHz)"),
+                    "p": popup,
+                    "c": compatible,
+                }
+            )
 
-        for i in range(0, len(repeaters), chunk_size):
-            chunk = repeaters[i : i + chunk_size]
-            markers: list[str] = []
-            for repeater in chunk:
-                lat = float(repeater.latitude)
-                lng = float(repeater.longitude)
-                callsign = repeater.callsign or t("Unknown")
-                city = repeater.location_nearest_city
-                state = repeater.state or ""
-                country = repeater.country or ""
-                frequency = str(repeater.frequency)
-
-                # Check if repeater is in the compatible set
-                repeater_id = (
-                    repeater.country,
-                    repeater.state_id,
-                    repeater.repeater_id,
-                )
-                compatible = repeater_id in compatible_ids
-                if compatible:
-                    compatible_count += 1
-                else:
-                    incompatible_count += 1
-
-                # Create marker with custom icon for incompatible repeaters
-                title = f"{callsign} ({frequency} MHz)"
-                status = "" if compatible else " " + t("⚠️ INCOMPATIBLE")
-                popup = (
-                    f"<b>{escape(callsign)}</b>{escape(status)}<br>"
-                    f"{escape(city)}, {escape(state)}<br>"
-                    f"{escape(country)}<br>"
-                    f"{escape(frequency)} MHz"
-                )
-
-                if not compatible:
-                    # Use divIcon with red background for incompatible repeaters
-                    icon_js = (
-                        "L.divIcon({className: 'custom-div-icon', "
-                        "html: '<div style=\"background-color:#c0392b;"
-                        "border-radius:50%;width:12px;height:12px;"
-                        "border:2px solid white;box-shadow:0 0 4px "
-                        "rgba(0,0,0,0.4);\"></div>', "
-                        "iconSize: [16, 16], iconAnchor: [8, 8]})"
-                    )
-                    marker = (
-                        "L.marker(["
-                        f"{lat}, {lng}"
-                        f"], {{title: {json.dumps(title)}, icon: {icon_js}}})"
-                        f".bindPopup({json.dumps(popup)})"
-                    )
-                else:
-                    # Use default marker for compatible repeaters
-                    marker = (
-                        "L.marker(["
-                        f"{lat}, {lng}"
-                        f"], {{title: {json.dumps(title)}}})"
-                        f".bindPopup({json.dumps(popup)})"
-                    )
-                markers.append(marker)
-            markers_expr = f"[{', '.join(markers)}]"
-            m.run_layer_method(repeater_cluster.id, ":addLayers", markers_expr)  # type: ignore[no-untyped-call]
+        # Keep the data server-side; the browser reports its viewport once a
+        # move/zoom settles (debounced) and gets back what is in view.
+        repeater_markers.load(payload)
+        ui.run_javascript(
+            f"""
+            (() => {{
+                try {{
+                    const el = getElement('{m.id}');
+                    if (!el || !el.map) return;
+                    const map = el.map;
+                    map.eachLayer(l => {{
+                        if (l.id === '{repeater_layer.id}') {{
+                            map._ogdrb_repeaterLayer = l;
+                        }}
+                    }});
+                    if (map._ogdrb_emitViewport) {{
+                        map.off('moveend', map._ogdrb_emitViewport);
+                    }}
+                    map._ogdrb_emitViewport = () => {{
+                        clearTimeout(map._ogdrb_viewportTimer);
+                        map._ogdrb_viewportTimer = setTimeout(() => {{
+                            const b = map.getBounds().pad(0.25);
+                            el.$emit('repeaters-viewport', {{
+                                south: b.getSouth(), west: b.getWest(),
+                                north: b.getNorth(), east: b.getEast(),
+                                zoom: map.getZoom(),
+                            }});
+                        }}, 150);
+                    }};
+                    map.on('moveend', map._ogdrb_emitViewport);
+                    map._ogdrb_emitViewport();
+                }} catch (e) {{ console.error('sync_repeater_markers', e); }}
+            }})();
+            """
+        )
 
         logger.info(
             "Displayed {} compatible (blue) and {} incompatible (red) repeaters",
@@ -635,6 +811,67 @@ async def index() -> None:  # noqa: C901, PLR0915
             incompatible_count,
         )
 
+    def render_repeater_viewport(e: GenericEventArguments) -> None:
+        # No early return on an empty load: the layer must still be cleared of
+        # the previous load's markers.
+        bounds = Bounds(
+            south=e.args["south"],
+            west=e.args["west"],
+            north=e.args["north"],
+            east=e.args["east"],
+        )
+        # NiceGUI's serializer (orjson where available) is much faster than the
+        # stdlib one on payloads of thousands of markers.
+        data = nicegui_json.dumps(
+            repeater_markers.viewport(bounds, int(e.args["zoom"]))
+        )
+        # Clusters and points are circle markers on one shared canvas renderer.
+        # Incompatible repeaters are red, and mixed co-located groups orange.
+        # A repeater popup that was open stays open across the redraw.
+        ui.run_javascript(
+            f"""
+            (() => {{
+                try {{
+                    const map = getElement('{m.id}')?.map;
+                    const layer = map?._ogdrb_repeaterLayer;
+                    if (!layer) return;
+                    const data = {data};
+                    const renderer = map._ogdrb_canvas ??= L.canvas({{padding: 0.5}});
+                    const openAt = layer.getLayers()
+                        .find(l => l.isPopupOpen())?.getLatLng();
+                    layer.clearLayers();
+                    for (const c of data.c) {{
+                        const [s, w, n, e] = c.b;
+                        L.circleMarker([c.lat, c.lng], {{
+                            renderer, weight: 2, color: 'white',
+                            radius: 12 + 4 * Math.log10(c.n),
+                            fillColor: '#2c7be5', fillOpacity: 0.7,
+                        }})
+                            .bindTooltip(String(c.n), {{
+                                permanent: true, direction: 'center',
+                            }})
+                            .on('click', () => map.fitBounds([[s, w], [n, e]]))
+                            .addTo(layer);
+                    }}
+                    for (const p of data.p) {{
+                        const marker = L.circleMarker([p.lat, p.lng], {{
+                            renderer, radius: 6, weight: 2, color: 'white',
+                            fillColor: p.c === null ? '#e67e22'
+                                : p.c ? '#3388ff' : '#c0392b',
+                            fillOpacity: 0.9,
+                        }})
+                            .bindTooltip(p.t)
+                            // No auto-pan: the pan would re-render and close
+                            // the popup. Merged co-located repeaters scroll.
+                            .bindPopup(p.p, {{autoPan: false, maxHeight: 300}})
+                            .addTo(layer);
+                        if (openAt?.equals([p.lat, p.lng])) marker.openPopup();
+                    }}
+                }} catch (e) {{ console.error('render_repeater_viewport', e); }}
+            }})();
+            """
+        )
+
     async def populate_repeaters() -> None:
         filters = validate_filters()
         if not filters:
@@ -698,7 +935,7 @@ async def index() -> None:  # noqa: C901, PLR0915
         loading.set_visibility(True)
         try:
             country_names = frozenset(c.name for c in countries)
-            repeaters_by_zone = get_repeaters(
+            repeaters_by_zone = await get_repeaters(
                 zones={
                     row["name"]: Radius(
                         origin=LatLon(lat=row["lat"], lon=row["lng"]),
@@ -748,10 +985,7 @@ async def index() -> None:  # noqa: C901, PLR0915
                     with_input=True,
                     multiple=True,
                     clearable=True,
-                    options={
-                        country.alpha_2: territory_name(country.alpha_2)  # type: ignore[no-untyped-call]
-                        for country in pycountry.countries
-                    },
+                    options={code: territory_name(code) for code in COUNTRY_CODES},
                 )
                 select_us_state = ui.select(
                     label=t("Select US states"),
@@ -898,34 +1132,10 @@ async def index() -> None:  # noqa: C901, PLR0915
     m = ui.leaflet(
         center=(0.0, 0.0),
         zoom=2,
-        draw_control={
-            "draw": {
-                "circle": True,
-                # disable all other shapes
-                "marker": False,
-                "polygon": False,
-                "polyline": False,
-                "rectangle": False,
-                "circlemarker": False,
-            },
-            "edit": {"edit": True, "remove": True},
-        },
-        additional_resources=[
-            "https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.css",
-            "https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.Default.css",
-            "https://unpkg.com/leaflet.markercluster@1.5.3/dist/leaflet.markercluster.js",
-        ],
+        draw_control=copy.deepcopy(DRAW_CONTROL),
     ).classes("w-full h-96")
-    repeater_cluster = m.generic_layer(
-        name="markerClusterGroup",
-        args=[
-            {
-                "chunkedLoading": True,
-                "showCoverageOnHover": False,
-                "maxClusterRadius": 60,
-            }
-        ],
-    )
+    # Container for the repeater clusters/points drawn by sync_repeater_markers()
+    repeater_layer = m.generic_layer(name="layerGroup", args=[])
 
     columns = [
         AGColumnDef(field="name", headerName=t("Name"), editable=True),
@@ -936,15 +1146,7 @@ async def index() -> None:  # noqa: C901, PLR0915
     ]
 
     aggrid = ui.aggrid(
-        {
-            "defaultColDef": {
-                "sortable": False,
-            },
-            "columnDefs": columns,
-            "rowData": [],
-            "rowSelection": {"mode": "multiRow"},
-            "stopEditingWhenCellsLoseFocus": True,
-        },
+        {**copy.deepcopy(AGGRID_OPTIONS), "columnDefs": columns, "rowData": []},
         theme="balham",
     )
 
@@ -956,6 +1158,7 @@ async def index() -> None:  # noqa: C901, PLR0915
     m.on("draw:editresize", zm.handle_draw_edit_move_or_resize)
     m.on("draw:deleted", zm.handle_draw_deleted)
     m.on("circle-click", zm.handle_circle_click)
+    m.on("repeaters-viewport", render_repeater_viewport)
     aggrid.on("cellValueChanged", zm.handle_cell_value_changed)
     aggrid.on("rowSelected", zm.handle_selection_changed)
     aggrid.on("gridReady", zm.handle_grid_ready)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 __all__: tuple[str, ...] = (
+    "DOWNLOAD_TTL",
     "US_COUNTRY_CODE",
     "US_COUNTRY_NAME",
     "RepeaterId",
@@ -13,7 +14,12 @@ __all__: tuple[str, ...] = (
     "prepare_local_repeaters",
 )
 
-from typing import TYPE_CHECKING, Any, NamedTuple
+import functools
+import math
+import operator
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
 import anyio
 import pycountry
@@ -27,11 +33,18 @@ from repeaterbook.services import RepeaterBookAPI
 from sqlmodel import col, or_
 
 from ogdrb.converters import BANDWIDTH, repeater_to_channels
+from ogdrb.geo import RepeaterIndex
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from typing import Self
 
+    from anyio.streams.memory import (
+        MemoryObjectReceiveStream,
+        MemoryObjectSendStream,
+    )
     from opengd77.models import AnalogChannel, DigitalChannel
+    from pycountry.db import Country
     from repeaterbook.utils import Radius
     from sqlalchemy.sql.elements import BinaryExpression, ColumnElement
 
@@ -49,6 +62,26 @@ _RB_API = RepeaterBookAPI(
 )
 _RB = RepeaterBook(working_dir=Path())
 
+# How long (in seconds) a downloaded query is considered fresh. Within this window
+# the local database already holds its repeaters, so it isn't downloaded again.
+DOWNLOAD_TTL: Final[float] = 60 * 60
+# Last download time (``time.monotonic()``) of each per-country/per-state query.
+_downloaded_at: dict[ExportQuery, float] = {}
+
+# Downloaded repeaters are written to the local database in batches of this size.
+_POPULATE_BATCH_SIZE: Final[int] = 500
+
+# Caps concurrent RepeaterBook API downloads across all clients, so selecting
+# many US states doesn't flood the API with requests.
+_DOWNLOAD_LIMITER: Final = anyio.CapacityLimiter(8)
+
+# Caps concurrent local database queries across all clients (each in a thread).
+_QUERY_LIMITER: Final = anyio.CapacityLimiter(4)
+
+# Serializes local database writes across all clients: SQLite allows a single
+# writer, and concurrent write transactions fail with "database is locked".
+_WRITE_LIMITER: Final = anyio.CapacityLimiter(1)
+
 
 class RepeaterId(NamedTuple):
     """Unique identifier for a repeater."""
@@ -58,6 +91,15 @@ class RepeaterId(NamedTuple):
     repeater_id: int
 
 
+_get_id_fields = operator.attrgetter("country", "state_id", "repeater_id")
+
+
+def _repeater_id(rb: Repeater) -> RepeaterId:
+    """Return the unique identifier of a RepeaterBook repeater."""
+    country, state_id, repeater_id = _get_id_fields(rb)
+    return RepeaterId(country or "", state_id, repeater_id)
+
+
 @frozen
 class UniRepeater:
     """Universal repeater model."""
@@ -73,7 +115,7 @@ class UniRepeater:
         analog, digital = repeater_to_channels(rb)
         return cls(
             rb=rb,
-            id=RepeaterId(rb.country or "", rb.state_id, rb.repeater_id),
+            id=_repeater_id(rb),
             analog=analog,
             digital=digital,
         )
@@ -90,38 +132,41 @@ def build_export_queries(
     risks hitting RepeaterBook's result-count cap.  US requests are further
     split per selected state to stay within the same cap.
     """
-    us_country = next(
-        (country for country in export.countries if country.alpha_2 == US_COUNTRY_CODE),
-        None,
-    )
+    # Partition in a single pass; non-US countries sorted for stable output.
+    us_country: Country | None = None
+    non_us_countries: list[Country] = []
+    for country in export.countries:
+        if country.alpha_2 == US_COUNTRY_CODE:
+            us_country = country
+        else:
+            non_us_countries.append(country)
+    non_us_countries.sort(key=lambda c: c.alpha_2)
+
     if us_country is None:
         # No US selected — split non-US countries into individual queries.
         return [
             evolve(export, countries=frozenset((country,)))
-            for country in sorted(export.countries, key=lambda c: c.alpha_2)
+            for country in non_us_countries
         ]
 
     if not us_state_ids:
         msg = "US states must be selected when US is in countries"
         raise ValueError(msg)
 
-    queries_: list[ExportQuery] = []
-    non_us_countries = frozenset(
-        country for country in export.countries if country.alpha_2 != US_COUNTRY_CODE
-    )
-    queries_.extend(
+    queries_: list[ExportQuery] = [
         evolve(
             export,
             countries=frozenset((country,)),
             state_ids=frozenset(),
         )
-        for country in sorted(non_us_countries, key=lambda c: c.alpha_2)
-    )
+        for country in non_us_countries
+    ]
 
+    us_only = frozenset((us_country,))
     queries_.extend(
         evolve(
             export,
-            countries=frozenset((us_country,)),
+            countries=us_only,
             state_ids=frozenset((state_id,)),
         )
         for state_id in sorted(us_state_ids)
@@ -129,34 +174,45 @@ def build_export_queries(
     return queries_
 
 
-def _compatibility_filters() -> list[Any]:
-    """Return SQL filters for repeater compatibility with OpenGD77.
+# SQL filters for repeater compatibility with OpenGD77.
+#
+# These filters are used by both map display and zone export to ensure
+# consistency. Repeaters must meet ALL of these criteria:
+# - Be DMR or analog capable
+# - Have "On-air" operational status
+# - Have "Open" membership (not private/closed)
+# - Operate on 2m (144-148 MHz) or 70cm (420-450 MHz) bands
+# - Have valid FM bandwidth (12.5/25 kHz) or None (digital-only)
+#
+# Built once at import: SQLAlchemy expressions are immutable and can be reused
+# across queries.
+_COMPATIBILITY_FILTERS: Final[tuple[Any, ...]] = (
+    Repeater.dmr_capable | Repeater.analog_capable,
+    Repeater.operational_status == Status.ON_AIR,
+    Repeater.use_membership == Use.OPEN,
+    queries.band(Bands.M_2.value, Bands.CM_70.value),
+    or_(
+        col(Repeater.fm_bandwidth).is_(None),
+        col(Repeater.fm_bandwidth).in_(tuple(BANDWIDTH)),
+    ),
+)
 
-    These filters are used by both map display and zone export to ensure
-    consistency. Repeaters must meet ALL of these criteria:
-    - Be DMR or analog capable
-    - Have "On-air" operational status
-    - Have "Open" membership (not private/closed)
-    - Operate on 2m (144-148 MHz) or 70cm (420-450 MHz) bands
-    - Have valid FM bandwidth (12.5/25 kHz) or None (digital-only)
-    """
-    return [
-        Repeater.dmr_capable | Repeater.analog_capable,
-        Repeater.operational_status == Status.ON_AIR,
-        Repeater.use_membership == Use.OPEN,
-        queries.band(Bands.M_2.value, Bands.CM_70.value),
-        or_(
-            col(Repeater.fm_bandwidth).is_(None),
-            *(Repeater.fm_bandwidth == bw for bw in BANDWIDTH),
-        ),
-    ]
+
+@functools.lru_cache(maxsize=128)
+def _country_names(countries: frozenset[Country]) -> frozenset[str]:
+    """Return the database country names for a (hashable) set of countries."""
+    return frozenset(country.name for country in countries)
 
 
+@functools.lru_cache(maxsize=256)
 def _country_state_filters(
-    country_names: set[str] | frozenset[str],
+    country_names: frozenset[str],
     us_state_ids: frozenset[str],
-) -> list[BinaryExpression[bool] | ColumnElement[bool]]:
-    """Build SQL filters that restrict results to the given countries/states."""
+) -> tuple[BinaryExpression[bool] | ColumnElement[bool], ...]:
+    """Build SQL filters that restrict results to the given countries/states.
+
+    Cached by the (hashable) inputs, so UI re-filters reuse the same clauses.
+    """
     filters: list[BinaryExpression[bool] | ColumnElement[bool]] = []
     if country_names:
         filters.append(col(Repeater.country).in_(country_names))
@@ -167,14 +223,14 @@ def _country_state_filters(
                 col(Repeater.state_id).in_(us_state_ids),
             )
         )
-    return filters
+    return tuple(filters)
 
 
 def get_compatible_repeaters(
     export: ExportQuery,
     *,
     us_state_ids: frozenset[str] = frozenset(),
-) -> list[Repeater]:
+) -> Sequence[Repeater]:
     """Query compatible repeaters from local database.
 
     Returns only repeaters that pass the compatibility filters.
@@ -182,16 +238,80 @@ def get_compatible_repeaters(
 
     NOTE: Database must be pre-populated via prepare_local_repeaters() first.
     """
-    country_names = {country.name for country in export.countries}
+    country_names = _country_names(export.countries)
     where: list[BinaryExpression[bool] | ColumnElement[bool]] = [
-        *_compatibility_filters(),
+        *_COMPATIBILITY_FILTERS,
         *_country_state_filters(country_names, us_state_ids),
     ]
 
-    return list(_RB.query(*where))
+    return _RB.query(*where)
 
 
-def get_repeaters(
+class _IndexCache:
+    """Spatial indexes of compatible repeaters, per country/state selection.
+
+    Cleared whenever the local database is repopulated. An index whose build
+    overlapped a repopulation is still returned to its caller, but not cached.
+
+    Indexes hold full repeater rows, and overlapping selections hold copies of
+    the same rows, so the cache is bounded by its total number of rows too.
+    """
+
+    def __init__(self, maxsize: int = 2, max_rows: int = 20_000) -> None:
+        """Keep at most ``maxsize`` indexes of ``max_rows`` repeaters in total.
+
+        The oldest indexes are evicted first. An index larger than ``max_rows``
+        on its own is never cached.
+        """
+        self._maxsize = maxsize
+        self._max_rows = max_rows
+        self._generation = 0
+        self._indexes: dict[tuple[frozenset[str], frozenset[str]], RepeaterIndex] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop every index, as the local database changed."""
+        with self._lock:
+            self._generation += 1
+            self._indexes.clear()
+
+    def get(
+        self,
+        country_names: frozenset[str],
+        us_state_ids: frozenset[str],
+    ) -> RepeaterIndex:
+        """Return the index for a selection, querying the database if needed.
+
+        Blocking, so it must run in a worker thread.
+        """
+        key = (country_names, us_state_ids)
+        with self._lock:
+            generation = self._generation
+            if (index := self._indexes.get(key)) is not None:
+                return index
+
+        index = RepeaterIndex(
+            _RB.query(
+                *_COMPATIBILITY_FILTERS,
+                *_country_state_filters(country_names, us_state_ids),
+            )
+        )
+        logger.info("Indexed {} compatible repeaters", len(index))
+
+        with self._lock:
+            if generation == self._generation and len(index) <= self._max_rows:
+                self._indexes[key] = index
+                while len(self._indexes) > self._maxsize or (
+                    sum(map(len, self._indexes.values())) > self._max_rows
+                ):
+                    del self._indexes[next(iter(self._indexes))]
+        return index
+
+
+_repeater_indexes = _IndexCache()
+
+
+async def get_repeaters(
     zones: dict[str, Radius],
     *,
     country_names: frozenset[str] = frozenset(),
@@ -199,78 +319,131 @@ def get_repeaters(
 ) -> dict[str, list[UniRepeater]]:
     """Query repeaters from local database by zone.
 
+    The compatible repeaters of the selected countries/states are loaded once
+    into an in-memory spatial index, reused until the local database is
+    repopulated, and each zone is then a radius query on that index. The work
+    runs in a worker thread so the event loop stays responsive, and at most a
+    few queries (across all clients) run at once. The result keeps the order
+    of ``zones``.
+
     NOTE: Expects the database to be pre-populated via prepare_local_repeaters().
     The UI should call prepare_local_repeaters() before calling this function.
     """
-    extra_filters = _country_state_filters(
-        frozenset(country_names) if country_names else frozenset(), us_state_ids
-    )
-
-    result: dict[str, list[UniRepeater]] = {}
-    for name, radius in zones.items():
-        logger.info(
-            "Zone '{}': lat={}, lon={}, radius={} {}",
-            name,
-            radius.origin.lat,
-            radius.origin.lon,
-            radius.distance,
-            radius.unit,
-        )
-
-        queried = _RB.query(
-            queries.square(radius), *_compatibility_filters(), *extra_filters
-        )
-        filtered = list(queries.filter_radius(queried, radius))
-        logger.info("Found {} repeaters in zone '{}'", len(filtered), name)
-        result[name] = [UniRepeater.from_rb(r) for r in filtered]
-
-    return result
+    if not zones:
+        return {}
+
+    def _query_zones() -> dict[str, list[UniRepeater]]:
+        index = _repeater_indexes.get(country_names, us_state_ids)
+
+        # Repeaters in overlapping zones are converted only once. The index
+        # returns the same objects for every zone (and keeps them alive), so
+        # they're keyed by identity, and only from_rb builds their ID.
+        converted: dict[int, UniRepeater] = {}
+
+        def _convert(rb: Repeater) -> UniRepeater:
+            if (uni := converted.get(id(rb))) is None:
+                uni = converted[id(rb)] = UniRepeater.from_rb(rb)
+            return uni
+
+        results: dict[str, list[UniRepeater]] = {}
+        for name, radius in zones.items():
+            logger.info(
+                "Zone '{}': lat={}, lon={}, radius={} {}",
+                name,
+                radius.origin.lat,
+                radius.origin.lon,
+                radius.distance,
+                radius.unit,
+            )
+            filtered = index.within(radius)
+            logger.info("Found {} repeaters in zone '{}'", len(filtered), name)
+            results[name] = list(map(_convert, filtered))
+        return results
+
+    return await anyio.to_thread.run_sync(_query_zones, limiter=_QUERY_LIMITER)
+
+
+async def _ingest_repeaters(
+    receive: MemoryObjectReceiveStream[list[Repeater]],
+) -> None:
+    """Deduplicate streamed repeater batches and populate the local database."""
+    seen: set[RepeaterId] = set()
+    buffer: list[Repeater] = []
+    flushed = False
+    async with receive:
+        async for batch in receive:
+            for repeater in batch:
+                key = _repeater_id(repeater)
+                if key in seen:
+                    continue
+                seen.add(key)
+                buffer.append(repeater)
+                if len(buffer) >= _POPULATE_BATCH_SIZE:
+                    await anyio.to_thread.run_sync(
+                        _RB.populate, buffer, limiter=_WRITE_LIMITER
+                    )
+                    buffer = []
+                    flushed = True
+    # Always populate at least once, so the database is initialized.
+    if buffer or not flushed:
+        await anyio.to_thread.run_sync(_RB.populate, buffer, limiter=_WRITE_LIMITER)
 
 
 async def prepare_local_repeaters(
     export: ExportQuery,
     *,
     us_state_ids: frozenset[str] = frozenset(),
-) -> list[Repeater]:
+) -> Sequence[Repeater]:
     """Download repeaters and populate local database for the selected filters.
 
     Downloads are performed in parallel for faster processing when multiple
-    queries are needed (e.g., multiple US states).
+    queries are needed (e.g., multiple US states). Queries downloaded less than
+    ``DOWNLOAD_TTL`` seconds ago are already in the local database, so they are
+    not downloaded again.
     """
-    results: dict[int, list[Repeater]] = {}
 
-    async def _download_one(query: ExportQuery, idx: int) -> None:
+    async def _download_one(
+        query: ExportQuery, idx: int, send: MemoryObjectSendStream[list[Repeater]]
+    ) -> None:
+        async with send:
+            try:
+                async with _DOWNLOAD_LIMITER:
+                    batch = await _RB_API.download(query=query)
+            except Exception:
+                logger.exception("Error downloading repeaters for query {}", idx)
+                raise
+            await send.send(batch)
+
+    now = time.monotonic()
+    queries_list = [
+        query
+        for query in build_export_queries(export, us_state_ids=us_state_ids)
+        if now - _downloaded_at.get(query, -math.inf) >= DOWNLOAD_TTL
+    ]
+    if queries_list:
+        # Downloads stream their batches to a single consumer, which
+        # deduplicates and writes them while other downloads are in flight.
+        send, receive = anyio.create_memory_object_stream[list[Repeater]](
+            max_buffer_size=4
+        )
         try:
-            results[idx] = await _RB_API.download(query=query)
-        except Exception:
-            logger.exception("Error downloading repeaters for query {}", idx)
-            raise
-
-    queries_list = build_export_queries(export, us_state_ids=us_state_ids)
-    try:
-        async with anyio.create_task_group() as tg:
-            for idx, query in enumerate(queries_list):
-                tg.start_soon(_download_one, query, idx)
-    except ExceptionGroup as eg:
-        logger.error("One or more errors occurred during repeater downloads:")
-        for exc in eg.exceptions:
-            logger.error(" - {}", exc)
-        msg = "Failed to download repeaters"
-        raise RuntimeError(msg) from eg
-
-    unique_repeaters = {
-        RepeaterId(
-            repeater.country or "",
-            repeater.state_id,
-            repeater.repeater_id,
-        ): repeater
-        for batch in results.values()
-        for repeater in batch
-    }
-
-    _RB.populate(unique_repeaters.values())
-
-    country_names = {country.name for country in export.countries}
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(_ingest_repeaters, receive)
+                async with send:
+                    for idx, query in enumerate(queries_list):
+                        tg.start_soon(_download_one, query, idx, send.clone())
+        except ExceptionGroup as eg:
+            logger.error("One or more errors occurred during repeater downloads:")
+            for exc in eg.exceptions:
+                logger.error(" - {}", exc)
+            msg = "Failed to download repeaters"
+            raise RuntimeError(msg) from eg
+        finally:
+            # Some batches may have been written even if a download failed.
+            _repeater_indexes.invalidate()
+        _downloaded_at.update(dict.fromkeys(queries_list, now))
+
+    country_names = _country_names(export.countries)
     where = _country_state_filters(country_names, us_state_ids)
 
-    return list(_RB.query(*where))
+    return _RB.query(*where)
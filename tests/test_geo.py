@@ -0,0 +1,191 @@
+"""Tests for geo."""
+
+# ruff: noqa: PLR2004, SLF001
+
+from __future__ import annotations
+
+import os
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pytest
+from haversine import Unit, haversine  # type: ignore[import-untyped]
+from repeaterbook import Repeater
+from repeaterbook.utils import LatLon, Radius
+
+from ogdrb import geo
+from ogdrb.geo import (
+    Bounds,
+    RepeaterIndex,
+    coordinates,
+    filter_radius,
+    grid_cluster,
+    haversine_km,
+)
+
+
+def _repeater(repeater_id: int, lat: str, lng: str) -> Repeater:
+    return Repeater(
+        state_id="BC",
+        repeater_id=repeater_id,
+        country="Canada",
+        frequency=Decimal("146.52"),
+        input_frequency=Decimal("146.52"),
+        latitude=Decimal(lat),
+        longitude=Decimal(lng),
+        location_nearest_city="Vancouver",
+    )
+
+
+def test_haversine_km_matches_haversine_package() -> None:
+    """Vectorized distances match the scalar ``haversine`` implementation."""
+    origin = (49.2827, -123.1207)
+    points = [(43.6532, -79.3832), (49.2827, -123.1207), (-33.8688, 151.2093)]
+
+    result = haversine_km(
+        origin[0],
+        origin[1],
+        np.array([p[0] for p in points]),
+        np.array([p[1] for p in points]),
+    )
+
+    for distance, point in zip(result, points, strict=True):
+        assert distance == pytest.approx(haversine(origin, point))
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_compiled_distances_match_numpy(dtype: type[np.floating[Any]]) -> None:
+    """The optional numba kernel matches the NumPy implementation.
+
+    Skipped without numba, unless ``OGDRB_REQUIRE_NUMBA`` is set (as in the
+    ``test_numba`` nox session), where a missing kernel is a failure.
+    """
+    if not os.environ.get("OGDRB_REQUIRE_NUMBA"):
+        pytest.importorskip("numba")
+    assert geo._distances_km is not haversine_km
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(-90.0, 90.0, 1000).astype(dtype)
+    lngs = rng.uniform(-180.0, 180.0, 1000).astype(dtype)
+
+    result = geo._distances_km(49.2827, -123.1207, lats, lngs)
+
+    assert result.dtype == dtype
+    np.testing.assert_allclose(
+        result, haversine_km(49.2827, -123.1207, lats, lngs), rtol=1e-4, atol=1e-3
+    )
+
+
+def test_coordinates_single_precision() -> None:
+    """Coordinates are returned as float32 arrays, in repeater order."""
+    lats, lngs = coordinates([_repeater(1, "49.29", "-123.12"), _repeater(2, "1", "2")])
+
+    assert lats.dtype == lngs.dtype == np.float32
+    assert lats.tolist() == pytest.approx([49.29, 1.0])
+    assert lngs.tolist() == pytest.approx([-123.12, 2.0])
+
+
+def test_filter_radius_keeps_within_and_sorts_by_distance() -> None:
+    """Repeaters outside the radius are dropped, the rest sorted by distance."""
+    far = _repeater(1, "49.5", "-123.1207")  # ~24 km north
+    near = _repeater(2, "49.29", "-123.1207")  # ~1 km north
+    outside = _repeater(3, "43.6532", "-79.3832")  # Toronto
+    radius = Radius(origin=LatLon(lat=49.2827, lon=-123.1207), distance=30.0)
+
+    assert filter_radius([far, near, outside], radius) == [near, far]
+
+
+def test_filter_radius_respects_unit() -> None:
+    """The radius distance is interpreted in the radius unit."""
+    repeater = _repeater(1, "49.29", "-123.1207")  # ~0.8 km north
+    origin = LatLon(lat=49.2827, lon=-123.1207)
+
+    inside = Radius(origin=origin, distance=1000.0, unit=Unit.METERS)
+    outside = Radius(origin=origin, distance=500.0, unit=Unit.METERS)
+
+    assert filter_radius([repeater], inside) == [repeater]
+    assert filter_radius([repeater], outside) == []
+
+
+def test_filter_radius_empty() -> None:
+    """An empty input yields an empty output."""
+    radius = Radius(origin=LatLon(lat=0.0, lon=0.0), distance=10.0)
+
+    assert filter_radius([], radius) == []
+
+
+def test_repeater_index_matches_filter_radius() -> None:
+    """Radius queries on the index give the same result as filter_radius."""
+    repeaters = [
+        _repeater(1, "49.5", "-123.1207"),  # ~24 km north
+        _repeater(2, "49.29", "-123.1207"),  # ~1 km north
+        _repeater(3, "43.6532", "-79.3832"),  # Toronto
+        _repeater(4, "49.0", "-123.1207"),  # ~31 km south
+    ]
+    index = RepeaterIndex(repeaters)
+    origin = LatLon(lat=49.2827, lon=-123.1207)
+
+    assert len(index) == 4
+    for distance in (0.5, 30.0, 35.0, 5000.0):
+        radius = Radius(origin=origin, distance=distance)
+        assert index.within(radius) == filter_radius(repeaters, radius)
+
+
+WORLD = Bounds(south=-90.0, west=-180.0, north=90.0, east=180.0)
+
+
+def test_grid_cluster_groups_nearby_points() -> None:
+    """Nearby points share a cluster, isolated points stay unclustered."""
+    lats = np.array([49.28, 49.29, 49.30, -33.87])
+    lngs = np.array([-123.12, -123.11, -123.10, 151.21])
+
+    clusters, points = grid_cluster(lats, lngs, 4, WORLD)
+
+    assert len(clusters) == 1
+    assert clusters[0].size == 3
+    assert clusters[0].lat == pytest.approx(49.29)
+    assert clusters[0].bounds == Bounds(49.28, -123.12, 49.30, -123.10)
+    assert points.tolist() == [3]
+
+
+def test_grid_cluster_only_visible_points() -> None:
+    """Points outside the bounds are left out entirely."""
+    lats = np.array([49.28, -33.87])
+    lngs = np.array([-123.12, 151.21])
+    bounds = Bounds(south=40.0, west=-130.0, north=60.0, east=-110.0)
+
+    clusters, points = grid_cluster(lats, lngs, 4, bounds)
+
+    assert clusters == []
+    assert points.tolist() == [0]
+
+
+def test_grid_cluster_bounds_across_antimeridian() -> None:
+    """Bounds that wrap around the antimeridian still match both sides."""
+    lats = np.array([0.0, 0.0, 0.0])
+    lngs = np.array([179.0, -179.0, 0.0])
+    bounds = Bounds(south=-10.0, west=170.0, north=10.0, east=190.0)
+
+    _, points = grid_cluster(lats, lngs, 10, bounds)
+
+    assert points.tolist() == [0, 1]
+
+
+def test_grid_cluster_no_clusters_past_max_zoom() -> None:
+    """Past the maximum zoom every visible point is returned on its own."""
+    lats = np.array([49.28, 49.28])
+    lngs = np.array([-123.12, -123.12])
+
+    clusters, points = grid_cluster(lats, lngs, 17, WORLD, max_zoom=16)
+
+    assert clusters == []
+    assert points.tolist() == [0, 1]
+
+
+def test_grid_cluster_empty() -> None:
+    """With nothing loaded there is nothing to draw."""
+    clusters, points = grid_cluster(np.empty(0), np.empty(0), 4, WORLD)
+
+    assert clusters == []
+    assert points.tolist() == []
@@ -138,6 +138,10 @@ class TestTerritoryName:
         name = territory_name("BR")
         assert name == "Brazil"
 
+    def test_unrecognized_code_passthrough(self) -> None:
+        """Codes unknown to Babel return the code itself."""
+        assert territory_name("XX") == "XX"
+
 
 class TestLanguageManager:
     """Tests for LanguageManager."""
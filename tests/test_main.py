@@ -6,7 +6,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ogdrb.main import ZoneManager, ZoneRow
+import pytest
+from nicegui import json as nicegui_json
+
+from ogdrb.geo import Bounds
+from ogdrb.main import (
+    RepeaterMarkers,
+    ZoneManager,
+    ZoneRow,
+    merge_colocated_markers,
+)
 
 if TYPE_CHECKING:
     from typing import Any
@@ -159,3 +168,139 @@ def test_zone_manager_iter_event_layers() -> None:
     event3.args = {}
     layers3 = ZoneManager._iter_event_layers(event3)
     assert len(layers3) == 0
+
+
+async def test_zone_manager_row_index_tracks_edits_and_deletes() -> None:
+    """Test that the row index follows cell edits and map deletions."""
+    from unittest.mock import Mock
+
+    rows = [
+        ZoneRow(id=1, name="Zone 1", lat=10.0, lng=20.0, radius=5.0),
+        ZoneRow(id=2, name="Zone 2", lat=30.0, lng=40.0, radius=10.0),
+    ]
+    zm = ZoneManager(MockLeaflet(), MockGrid(rows))  # type: ignore[arg-type]
+
+    # Rename only (no geometry change, so no JS call is needed)
+    edit = Mock()
+    edit.args = {
+        "data": {"id": 1, "name": "Renamed", "lat": 10, "lng": 20, "radius": 5}
+    }
+    await zm.handle_cell_value_changed(edit)
+
+    row1 = zm._find_row(1)
+    assert row1 is not None
+    assert row1["name"] == "Renamed"
+    assert zm.rows[0] is row1
+
+    # Delete zone 2 from the map
+    delete = Mock()
+    delete.args = {"layers": {"_layers": {"7": {"_ogdrb_row_id": 2}}}}
+    await zm.handle_draw_deleted(delete)
+
+    assert zm._find_row(2) is None
+    assert [r["id"] for r in zm.rows] == [1]
+
+
+async def test_zone_manager_set_circle_colors_sends_only_changes() -> None:
+    """Test that circle colors are only sent when they change."""
+    from unittest.mock import AsyncMock, patch
+
+    zm = ZoneManager(MockLeaflet(), MockGrid())  # type: ignore[arg-type]
+    zm._register(row_id=1, leaflet_id=10)
+    zm._register(row_id=2, leaflet_id=20)
+
+    with patch("ogdrb.main.ui.run_javascript", new=AsyncMock()) as run_js:
+        await zm._js_set_circle_colors({10: "blue", 20: "blue"})
+        assert run_js.await_count == 1
+
+        # Same colors again: nothing to send
+        await zm._js_set_circle_colors({10: "blue", 20: "blue"})
+        assert run_js.await_count == 1
+
+        # Only the changed circle is sent
+        await zm._js_set_circle_colors({10: "red", 20: "blue"})
+        assert run_js.await_count == 2
+        assert run_js.await_args is not None
+        assert '"10": "red"' in run_js.await_args.args[0]
+        assert '"20"' not in run_js.await_args.args[0]
+
+        # A re-registered circle is unknown again, so it is always sent
+        zm._unregister(1)
+        zm._register(row_id=1, leaflet_id=10)
+        await zm._js_set_circle_colors({10: "red"})
+        assert run_js.await_count == 3
+
+
+def test_merge_colocated_markers() -> None:
+    """Test that repeaters sharing coordinates become one marker."""
+    a = {"lat": 49.28, "lng": -123.12, "t": "A", "p": "<b>A</b>", "c": True}
+    b = {"lat": 49.28, "lng": -123.12, "t": "B", "p": "<b>B</b>", "c": True}
+    c = {"lat": 49.30, "lng": -123.12, "t": "C", "p": "<b>C</b>", "c": False}
+    d = {"lat": 49.30, "lng": -123.12, "t": "D", "p": "<b>D</b>", "c": True}
+    e = {"lat": 49.32, "lng": -123.12, "t": "E", "p": "<b>E</b>", "c": False}
+
+    merged = merge_colocated_markers([a, c, b, e, d])
+
+    assert merged == [
+        {
+            "lat": 49.28,
+            "lng": -123.12,
+            "t": "A<br>B",
+            "p": "<b>A</b><hr><b>B</b>",
+            "c": True,
+        },
+        # Mixed compatibility is neither blue nor red
+        {
+            "lat": 49.30,
+            "lng": -123.12,
+            "t": "C<br>D",
+            "p": "<b>C</b><hr><b>D</b>",
+            "c": None,
+        },
+        e,
+    ]
+
+
+def test_repeater_markers_viewport() -> None:
+    """Test the clusters and points sent for a viewport."""
+    markers = RepeaterMarkers()
+    vancouver = [
+        {"lat": 49.28, "lng": -123.12, "t": "A", "p": "A", "c": True},
+        {"lat": 49.29, "lng": -123.11, "t": "B", "p": "B", "c": False},
+    ]
+    sydney = {"lat": -33.87, "lng": 151.21, "t": "C", "p": "C", "c": True}
+    # Same site as Sydney's repeater
+    sydney_too = {"lat": -33.87, "lng": 151.21, "t": "D", "p": "D", "c": True}
+    markers.load([*vancouver, sydney, sydney_too])
+    world = Bounds(south=-90.0, west=-180.0, north=90.0, east=180.0)
+
+    data = markers.viewport(world, 4)
+
+    assert data["c"] == [
+        {
+            "lat": pytest.approx(49.285),
+            "lng": pytest.approx(-123.115),
+            "n": 2,
+            "b": (49.28, -123.12, 49.29, -123.11),
+        }
+    ]
+    assert data["p"] == [
+        {"lat": -33.87, "lng": 151.21, "t": "C<br>D", "p": "C<hr>D", "c": True}
+    ]
+    # Past the maximum zoom, nothing is clustered
+    assert markers.viewport(world, 17)["p"] == [*vancouver, data["p"][0]]
+    # Only what is in view is sent
+    assert markers.viewport(Bounds(-40.0, 150.0, -30.0, 160.0), 4) == data | {"c": []}
+    # The payload is JSON-serializable as is
+    assert nicegui_json.loads(nicegui_json.dumps(data))["c"][0]["n"] == 2
+
+
+def test_repeater_markers_clear() -> None:
+    """Test that an empty load (or clear) leaves nothing to draw."""
+    markers = RepeaterMarkers()
+    markers.load([{"lat": 49.28, "lng": -123.12, "t": "A", "p": "A", "c": True}])
+    world = Bounds(south=-90.0, west=-180.0, north=90.0, east=180.0)
+
+    markers.clear()
+
+    assert markers.viewport(world, 4) == {"c": [], "p": []}
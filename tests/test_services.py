@@ -1,12 +1,16 @@
 """Tests for services."""
 
-# ruff: noqa: PLR2004
+# ruff: noqa: PLR2004, SLF001
 
 from __future__ import annotations
 
+import threading
+import time
 from decimal import Decimal
+from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import anyio
 import pycountry
 import pytest
 from haversine import Unit  # type: ignore[import-untyped]
@@ -14,8 +18,22 @@ from repeaterbook import Repeater
 from repeaterbook.models import ExportQuery
 from repeaterbook.utils import LatLon, Radius
 
+from ogdrb import services
 from ogdrb.services import build_export_queries, get_repeaters, prepare_local_repeaters
 
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@pytest.fixture(autouse=True)
+def _clear_download_cache() -> Generator[None]:
+    """Start every test without any previously downloaded queries or indexes."""
+    services._downloaded_at.clear()
+    services._repeater_indexes.invalidate()
+    yield
+    services._downloaded_at.clear()
+    services._repeater_indexes.invalidate()
+
 
 def test_build_export_queries_single_non_us_country() -> None:
     """A single non-US country still produces one query."""
@@ -151,7 +169,101 @@ async def test_prepare_local_repeaters_downloads_and_deduplicates() -> None:
         assert result == [repeater1, repeater3]
 
 
-def test_get_repeaters_queries_by_zone() -> None:
+async def test_prepare_local_repeaters_skips_recent_downloads() -> None:
+    """Queries downloaded within DOWNLOAD_TTL are not downloaded again."""
+    canada = pycountry.countries.lookup("CA")
+    query = ExportQuery(countries=frozenset((canada,)))
+
+    with (
+        patch("ogdrb.services._RB_API") as mock_api,
+        patch("ogdrb.services._RB") as mock_rb,
+    ):
+        mock_api.download = AsyncMock(return_value=[])
+        mock_rb.query = MagicMock(return_value=[])
+
+        await prepare_local_repeaters(query)
+        await prepare_local_repeaters(query)
+
+        # Downloaded and populated once, but the local database is queried twice
+        assert mock_api.download.await_count == 1
+        mock_rb.populate.assert_called_once()
+        assert mock_rb.query.call_count == 2
+
+        # Once stale, the query is downloaded again
+        with patch("ogdrb.services.DOWNLOAD_TTL", 0):
+            await prepare_local_repeaters(query)
+        assert mock_api.download.await_count == 2
+
+
+async def test_prepare_local_repeaters_populates_in_batches() -> None:
+    """Large downloads are written to the database in batches."""
+    canada = pycountry.countries.lookup("CA")
+    query = ExportQuery(countries=frozenset((canada,)))
+    repeaters = [
+        Repeater(
+            state_id="BC",
+            repeater_id=repeater_id,
+            country="Canada",
+            frequency=Decimal("146.52"),
+            input_frequency=Decimal("146.52"),
+            latitude=Decimal("49.2827"),
+            longitude=Decimal("-123.1207"),
+            location_nearest_city="Vancouver",
+        )
+        for repeater_id in range(3)
+    ]
+
+    with (
+        patch("ogdrb.services._RB_API") as mock_api,
+        patch("ogdrb.services._RB") as mock_rb,
+        patch("ogdrb.services._POPULATE_BATCH_SIZE", 2),
+    ):
+        mock_api.download = AsyncMock(return_value=[*repeaters, repeaters[0]])
+        mock_rb.query = MagicMock(return_value=repeaters)
+
+        await prepare_local_repeaters(query)
+
+        batches = [list(call.args[0]) for call in mock_rb.populate.call_args_list]
+        assert batches == [repeaters[:2], repeaters[2:]]
+
+
+async def test_prepare_local_repeaters_serializes_writes() -> None:
+    """Concurrent loads never write to the local database at the same time."""
+    canada = pycountry.countries.lookup("CA")
+    mexico = pycountry.countries.lookup("MX")
+    lock = threading.Lock()
+    writers = 0
+    max_writers = 0
+
+    def populate(_repeaters: list[Repeater]) -> None:
+        nonlocal writers, max_writers
+        with lock:
+            writers += 1
+            max_writers = max(max_writers, writers)
+        time.sleep(0.05)
+        with lock:
+            writers -= 1
+
+    with (
+        patch("ogdrb.services._RB_API") as mock_api,
+        patch("ogdrb.services._RB") as mock_rb,
+    ):
+        mock_api.download = AsyncMock(return_value=[])
+        mock_rb.populate = MagicMock(side_effect=populate)
+        mock_rb.query = MagicMock(return_value=[])
+
+        async with anyio.create_task_group() as tg:
+            for country in (canada, mexico):
+                tg.start_soon(
+                    prepare_local_repeaters,
+                    ExportQuery(countries=frozenset((country,))),
+                )
+
+    assert mock_rb.populate.call_count == 2
+    assert max_writers == 1
+
+
+async def test_get_repeaters_queries_by_zone() -> None:
     """Test that get_repeaters queries the database by zone without re-downloading."""
     # Create a test zone
     zones = {
@@ -183,7 +295,7 @@ def test_get_repeaters_queries_by_zone() -> None:
         # Mock query to return test repeater
         mock_rb.query = MagicMock(return_value=[repeater1])
 
-        result = get_repeaters(zones)
+        result = await get_repeaters(zones)
 
         # Verify query was called (but NOT download)
         assert mock_rb.query.called
@@ -192,3 +304,170 @@ def test_get_repeaters_queries_by_zone() -> None:
         assert "Test Zone" in result
         assert len(result["Test Zone"]) == 1
         # The actual filtering is done by queries.filter_radius which we're not mocking
+
+
+async def test_get_repeaters_keeps_zone_order() -> None:
+    """Zones are queried together, and the result follows the input order."""
+    zones = {
+        name: Radius(origin=LatLon(lat=lat, lon=0.0), distance=10.0)
+        for name, lat in (("B", 10.0), ("A", 20.0), ("C", 30.0))
+    }
+
+    with patch("ogdrb.services._RB") as mock_rb:
+        mock_rb.query = MagicMock(return_value=[])
+
+        result = await get_repeaters(zones)
+
+    assert list(result) == ["B", "A", "C"]
+    assert mock_rb.query.call_count == 1
+
+
+async def test_get_repeaters_splits_single_query_by_zone() -> None:
+    """One query serves every zone, each keeping only repeaters in its radius."""
+    vancouver = Repeater(
+        state_id="BC",
+        repeater_id=1,
+        country="Canada",
+        frequency=Decimal("146.52"),
+        input_frequency=Decimal("146.52"),
+        latitude=Decimal("49.2827"),
+        longitude=Decimal("-123.1207"),
+        location_nearest_city="Vancouver",
+    )
+    toronto = Repeater(
+        state_id="ON",
+        repeater_id=2,
+        country="Canada",
+        frequency=Decimal("146.52"),
+        input_frequency=Decimal("146.52"),
+        latitude=Decimal("43.6532"),
+        longitude=Decimal("-79.3832"),
+        location_nearest_city="Toronto",
+    )
+    zones = {
+        "Vancouver": Radius(origin=LatLon(lat=49.2827, lon=-123.1207), distance=10.0),
+        "Toronto": Radius(origin=LatLon(lat=43.6532, lon=-79.3832), distance=10.0),
+    }
+
+    with patch("ogdrb.services._RB") as mock_rb:
+        mock_rb.query = MagicMock(return_value=[vancouver, toronto])
+
+        result = await get_repeaters(zones)
+
+    mock_rb.query.assert_called_once()
+    assert [r.rb for r in result["Vancouver"]] == [vancouver]
+    assert [r.rb for r in result["Toronto"]] == [toronto]
+
+
+async def test_get_repeaters_converts_overlapping_repeaters_once() -> None:
+    """A repeater in several overlapping zones is converted only once."""
+    repeater = Repeater(
+        state_id="BC",
+        repeater_id=1,
+        country="Canada",
+        frequency=Decimal("146.52"),
+        input_frequency=Decimal("146.52"),
+        latitude=Decimal("49.2827"),
+        longitude=Decimal("-123.1207"),
+        location_nearest_city="Vancouver",
+    )
+    origin = LatLon(lat=49.2827, lon=-123.1207)
+    zones = {
+        "Small": Radius(origin=origin, distance=5.0),
+        "Large": Radius(origin=origin, distance=50.0),
+    }
+
+    with (
+        patch("ogdrb.services._RB") as mock_rb,
+        patch.object(
+            services.UniRepeater,
+            "from_rb",
+            side_effect=services.UniRepeater.from_rb,
+        ) as from_rb,
+        patch(
+            "ogdrb.services._repeater_id", side_effect=services._repeater_id
+        ) as repeater_id,
+    ):
+        mock_rb.query = MagicMock(return_value=[repeater])
+
+        result = await get_repeaters(zones)
+
+    assert from_rb.call_count == 1
+    # Its ID is built once too
+    assert repeater_id.call_count == 1
+    assert result["Small"][0] is result["Large"][0]
+
+
+async def test_get_repeaters_reuses_index_until_repopulated() -> None:
+    """The local database is only queried again after it is repopulated."""
+    canada = pycountry.countries.lookup("CA")
+    zones = {"Zone": Radius(origin=LatLon(lat=49.2827, lon=-123.1207), distance=10.0)}
+    names = frozenset({"Canada"})
+
+    with (
+        patch("ogdrb.services._RB_API") as mock_api,
+        patch("ogdrb.services._RB") as mock_rb,
+    ):
+        mock_api.download = AsyncMock(return_value=[])
+        mock_rb.query = MagicMock(return_value=[])
+
+        await get_repeaters(zones, country_names=names)
+        await get_repeaters(zones, country_names=names)
+        assert mock_rb.query.call_count == 1
+
+        # A different selection gets its own index
+        await get_repeaters(zones, country_names=frozenset({"Mexico"}))
+        assert mock_rb.query.call_count == 2
+
+        # Repopulating the database (one more query for its result) drops them
+        await prepare_local_repeaters(ExportQuery(countries=frozenset((canada,))))
+        assert mock_rb.query.call_count == 3
+        await get_repeaters(zones, country_names=names)
+        assert mock_rb.query.call_count == 4
+
+
+def test_index_cache_is_bounded() -> None:
+    """Cached indexes are bounded in number and in total repeaters."""
+    cache = services._IndexCache(maxsize=2, max_rows=3)
+    one, two, three, four = (
+        (frozenset({country}), frozenset[str]())
+        for country in ("Canada", "Mexico", "Brazil", "Chile")
+    )
+
+    def cached() -> list[tuple[frozenset[str], frozenset[str]]]:
+        return list(cache._indexes)
+
+    def repeaters(count: int) -> list[Repeater]:
+        return [
+            Repeater(
+                state_id="BC",
+                repeater_id=repeater_id,
+                country="Canada",
+                frequency=Decimal("146.52"),
+                input_frequency=Decimal("146.52"),
+                latitude=Decimal("49.2827"),
+                longitude=Decimal("-123.1207"),
+                location_nearest_city="Vancouver",
+            )
+            for repeater_id in range(count)
+        ]
+
+    with patch("ogdrb.services._RB") as mock_rb:
+        mock_rb.query = MagicMock(return_value=repeaters(1))
+        cache.get(*one)
+        cache.get(*two)
+        cache.get(*three)
+        # At most two indexes, the oldest evicted first
+        assert cached() == [two, three]
+
+        mock_rb.query = MagicMock(return_value=repeaters(2))
+        cache.get(*four)
+        cache.get(*one)
+        # At most three repeaters in total
+        assert cached() == [one]
+
+        mock_rb.query = MagicMock(return_value=repeaters(4))
+        index = cache.get(*two)
+        # Too large to cache, but still returned
+        assert len(index) == 4
+        assert cached() == [one]